@@ -4,6 +4,11 @@ rule_based.py — Rule-based cryptographic misuse detector.
 Flags a code snippet as "insecure" if ANY of a set of heuristic rules match.
 Rules are based on common Java crypto API misuse patterns.
 
+If the optional `hyperscan` package is installed, the rule set is also
+compiled into a Hyperscan database and scanned with it.  Otherwise, if
+`google-re2` is installed, the combined rule pattern is compiled with RE2
+(a linear-time DFA engine); failing both, the stdlib `re` engine is used.
+
 Usage:
     from baselines.rule_based import predict, predict_batch
 
@@ -12,139 +17,323 @@ Usage:
 """
 
 import re
+from bisect import bisect_right
+from dataclasses import dataclass
 from typing import List
 
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
 
 # ── Rules ───────────────────────────────────────────────────────────
-# Each rule is a (name, compiled_regex) tuple.  If any regex matches,
-# the snippet is flagged as "insecure".
+# Each rule is a (name, regex) tuple.  If any regex matches, the snippet
+# is flagged as "insecure".  Patterns are written in lowercase and run
+# against code.lower(), which keeps the matcher out of IGNORECASE mode.
+#
+# Whitespace and digits are spelled out as ASCII classes (_WS, [0-9]) rather
+# than \s and \d: RE2's \s omits \v, and re's str patterns also match
+# Unicode spaces and digits, so the shorthands would make labels depend on
+# the installed backend and on whether a snippet is passed as str or bytes.
+
+_WS = r"[ \t\n\r\f\v]"
 
 _RULES = [
     # 1. AES/DES in ECB mode
-    (
-        "ecb_mode",
-        re.compile(
-            r"Cipher\.getInstance\s*\(\s*\"[^\"]*ECB[^\"]*\"",
-            re.IGNORECASE,
-        ),
-    ),
+    ("ecb_mode", rf"cipher\.getinstance{_WS}*\({_WS}*\"[^\"]*ecb[^\"]*\""),
     # 2. MD5 usage
-    (
-        "md5_hash",
-        re.compile(
-            r"MessageDigest\.getInstance\s*\(\s*\"MD5\"\s*\)",
-            re.IGNORECASE,
-        ),
-    ),
+    ("md5_hash", rf"messagedigest\.getinstance{_WS}*\({_WS}*\"md5\"{_WS}*\)"),
     # 3. SHA-1 usage
-    (
-        "sha1_hash",
-        re.compile(
-            r"MessageDigest\.getInstance\s*\(\s*\"SHA-?1\"\s*\)",
-            re.IGNORECASE,
-        ),
-    ),
+    ("sha1_hash", rf"messagedigest\.getinstance{_WS}*\({_WS}*\"sha-?1\"{_WS}*\)"),
     # 4. Hardcoded encryption key — byte array literal near SecretKeySpec
-    (
-        "hardcoded_key",
-        re.compile(
-            r"new\s+SecretKeySpec\s*\(\s*new\s+byte\s*\[\s*\]\s*\{",
-            re.IGNORECASE,
-        ),
-    ),
+    ("hardcoded_key", rf"new{_WS}+secretkeyspec{_WS}*\({_WS}*new{_WS}+byte{_WS}*\[{_WS}*\]{_WS}*\{{"),
     # 5. Hardcoded key — string literal .getBytes() passed to SecretKeySpec
-    (
-        "hardcoded_key_string",
-        re.compile(
-            r"new\s+SecretKeySpec\s*\(\s*\"[^\"]+\"\.getBytes",
-            re.IGNORECASE,
-        ),
-    ),
+    ("hardcoded_key_string", rf"new{_WS}+secretkeyspec{_WS}*\({_WS}*\"[^\"]+\"\.getbytes"),
     # 6. Static IV — new IvParameterSpec with hardcoded bytes
-    (
-        "static_iv",
-        re.compile(
-            r"new\s+IvParameterSpec\s*\(\s*new\s+byte\s*\[\s*\]\s*\{",
-            re.IGNORECASE,
-        ),
-    ),
+    ("static_iv", rf"new{_WS}+ivparameterspec{_WS}*\({_WS}*new{_WS}+byte{_WS}*\[{_WS}*\]{_WS}*\{{"),
     # 7. Insecure random — java.util.Random instead of SecureRandom
-    (
-        "insecure_random",
-        re.compile(
-            r"new\s+Random\s*\(",
-            re.IGNORECASE,
-        ),
-    ),
+    ("insecure_random", rf"new{_WS}+random{_WS}*\("),
     # 8. DES algorithm (broken by design)
-    (
-        "des_usage",
-        re.compile(
-            r"Cipher\.getInstance\s*\(\s*\"DES[^e]",
-            re.IGNORECASE,
-        ),
-    ),
+    ("des_usage", rf"cipher\.getinstance{_WS}*\({_WS}*\"des[^e]"),
     # 9. No-padding cipher (potential padding-oracle indicator)
-    (
-        "no_padding",
-        re.compile(
-            r"Cipher\.getInstance\s*\(\s*\"[^\"]*NoPadding[^\"]*\"",
-            re.IGNORECASE,
-        ),
-    ),
+    ("no_padding", rf"cipher\.getinstance{_WS}*\({_WS}*\"[^\"]*nopadding[^\"]*\""),
     # 10. Constant PBE iteration count too low (< 1000)
-    (
-        "low_pbe_iterations",
-        re.compile(
-            r"PBEKeySpec\s*\([^)]*,\s*(?:[1-9]\d{0,2})\s*[,)]",
-        ),
-    ),
+    ("low_pbe_iterations", rf"pbekeyspec{_WS}*\([^)]*,{_WS}*(?:[1-9][0-9]{{0,2}}){_WS}*[,)]"),
 ]
 
+_RULE_NAMES = [name for name, _ in _RULES]
+
+# Literals that every rule requires somewhere in its match.  A snippet that
+# contains none of them cannot trigger any rule, so the regex scan is skipped.
+# "random" rather than "new random": the rule allows any whitespace after new.
+_FAST_ANCHORS = (
+    "cipher.getinstance",
+    "messagedigest.getinstance",
+    "secretkeyspec",
+    "ivparameterspec",
+    "random",
+    "pbekeyspec",
+)
+
+
+@dataclass(frozen=True)
+class _RuleTables:
+    """Compiled rule set for one input type (str or bytes)."""
+
+    # Per-rule patterns, used by predict_detailed() to report every rule that
+    # fires (several rules can match at one offset, e.g. "DES/ECB/NoPadding").
+    patterns: list
+    # All rules fused into one alternation of named groups, so deciding
+    # whether a snippet is insecure takes a single scan instead of one per
+    # rule.  Compiled with RE2 when available, else with re.
+    combined: object
+    anchors: tuple
+    # Joins a batch into one corpus for predict_batch().  A match is only
+    # credited to a snippet if it ends before the separator that follows it.
+    batch_sep: str | bytes
+
+
+def _compile_tables(encode) -> _RuleTables:
+    """Compile the rule set, passing every pattern and literal through encode."""
+    return _RuleTables(
+        patterns=[(name, re.compile(encode(regex))) for name, regex in _RULES],
+        combined=(re2.compile if HAS_RE2 else re.compile)(encode(
+            "|".join(f"(?P<{name}>{regex})" for name, regex in _RULES)
+        )),
+        anchors=tuple(encode(anchor) for anchor in _FAST_ANCHORS),
+        batch_sep=encode("\x00"),
+    )
+
+
+# The rules are pure ASCII, so raw (undecoded) source bytes can be scanned
+# directly after bytes.lower() — no UTF-8 decode or str allocation needed.
+_STR_TABLES = _compile_tables(lambda s: s)
+_BYTES_TABLES = _compile_tables(lambda s: s.encode("ascii"))
+
+
+def _tables_for(code: str | bytes) -> _RuleTables:
+    """Pick the str or bytes rule tables matching the input type."""
+    if isinstance(code, (bytes, bytearray)):
+        return _BYTES_TABLES
+    return _STR_TABLES
+
+
+def _has_anchor(lowered: str | bytes, tables: _RuleTables) -> bool:
+    """Cheap substring pre-filter run before any regex work."""
+    return any(anchor in lowered for anchor in tables.anchors)
+
+
+# ── Hyperscan backend ───────────────────────────────────────────────
+# One database holds every rule (pattern ID == index into _RULES).
+# HS_FLAG_SINGLEMATCH reports each rule at most once per scan, which is
+# all predict() and predict_detailed() need.
+
+
+def _compile_hyperscan_db():
+    """Compile the rule set into a block-mode Hyperscan database."""
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[regex.encode("ascii") for _, regex in _RULES],
+        ids=list(range(len(_RULES))),
+        elements=len(_RULES),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_RULES),
+    )
+    return db
+
+
+_HS_DB = _compile_hyperscan_db() if HAS_HYPERSCAN else None
+
+
+def _compile_hyperscan_batch_db():
+    """
+    Compile the rule set for predict_batch()'s single scan over a corpus.
+
+    SINGLEMATCH would stop after the first snippet a rule fires on, so this
+    database reports every match instead, with its leftmost start offset
+    (HS_FLAG_SOM_LEFTMOST) to tell which snippet the match lies in.
+    """
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[regex.encode("ascii") for _, regex in _RULES],
+        ids=list(range(len(_RULES))),
+        elements=len(_RULES),
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_RULES),
+    )
+    return db
+
 
-def predict(code: str) -> str:
+_HS_BATCH_DB = _compile_hyperscan_batch_db() if HAS_HYPERSCAN else None
+
+
+def _hyperscan_rule_ids(lowered: str | bytes) -> set:
+    """Return the indices of every rule matching the lowered snippet."""
+    hits = set()
+
+    def on_match(rule_id, _start, _end, _flags, _context):
+        hits.add(rule_id)
+
+    if isinstance(lowered, str):
+        lowered = lowered.encode("utf-8", errors="replace")
+    _HS_DB.scan(lowered, match_event_handler=on_match)
+    return hits
+
+
+def _triggered_rules(lowered: str | bytes, tables: _RuleTables) -> List[str]:
+    """Names of all rules matching the lowered snippet, in _RULES order."""
+    if _HS_DB is not None:
+        return [_RULE_NAMES[i] for i in sorted(_hyperscan_rule_ids(lowered))]
+
+    match = tables.combined.search(lowered)
+    if not match:
+        return []
+
+    first = match.lastgroup
+    if isinstance(first, bytes):  # RE2 reports bytes group names for bytes
+        first = first.decode("ascii")
+
+    # The combined scan stops at the first hit; re-run only the rules
+    # that can still fire from there so co-located matches are reported.
+    triggered = [first]
+    for rule_name, pattern in tables.patterns:
+        if rule_name != first and pattern.search(lowered, match.start()):
+            triggered.append(rule_name)
+    triggered.sort(key=_RULE_NAMES.index)
+    return triggered
+
+
+def predict(code: str | bytes) -> str:
     """
     Classify a Java code snippet as 'secure' or 'insecure'.
 
     Args:
-        code: Java source code string.
+        code: Java source code, as a string or as raw bytes.
 
     Returns:
         'insecure' if any rule matches, 'secure' otherwise.
     """
-    for _rule_name, pattern in _RULES:
-        if pattern.search(code):
-            return "insecure"
-    return "secure"
+    tables = _tables_for(code)
+    lowered = code.lower()
+    if not _has_anchor(lowered, tables):
+        return "secure"
+
+    if _HS_DB is not None:
+        matched = bool(_hyperscan_rule_ids(lowered))
+    else:
+        matched = tables.combined.search(lowered) is not None
+    return "insecure" if matched else "secure"
+
 
+def _hyperscan_predict_batch(lowered: List[bytes]) -> List[str]:
+    """predict_batch() backend: one Hyperscan scan over the joined corpus."""
+    sep = b"\x00"
+    corpus = sep.join(lowered)
 
-def predict_batch(snippets: List[str]) -> List[str]:
+    # Offset of each snippet inside the joined corpus.
+    starts = []
+    offset = 0
+    for s in lowered:
+        starts.append(offset)
+        offset += len(s) + len(sep)
+
+    labels = ["secure"] * len(lowered)
+    straddled = set()
+
+    def on_match(_rule_id, start, end, _flags, _context):
+        # Every match end is reported, so credit the snippet the match ends
+        # in.  If its leftmost start lies in an earlier snippet, the match
+        # straddles a separator and may hide a shorter match inside this
+        # snippet; decide that snippet on its own after the scan.
+        idx = bisect_right(starts, end - 1) - 1
+        if labels[idx] == "insecure":
+            return
+        if start >= starts[idx] and end <= starts[idx] + len(lowered[idx]):
+            labels[idx] = "insecure"
+        else:
+            straddled.add(idx)
+
+    _HS_BATCH_DB.scan(corpus, match_event_handler=on_match)
+
+    for idx in straddled:
+        if labels[idx] == "secure" and _hyperscan_rule_ids(lowered[idx]):
+            labels[idx] = "insecure"
+    return labels
+
+
+def predict_batch(snippets: List[str] | List[bytes]) -> List[str]:
     """
     Classify a batch of Java code snippets.
 
     Args:
-        snippets: List of Java source code strings.
+        snippets: List of Java source code strings, or list of raw bytes
+                  (all snippets must be of the same type).
 
     Returns:
         List of labels ('secure' or 'insecure').
     """
-    return [predict(s) for s in snippets]
+    if not snippets:
+        return []
+
+    if _HS_BATCH_DB is not None:
+        lowered = [s.lower() for s in snippets]
+        if isinstance(lowered[0], str):
+            lowered = [s.encode("utf-8", errors="replace") for s in lowered]
+        return _hyperscan_predict_batch(lowered)
 
+    tables = _tables_for(snippets[0])
+    sep = tables.batch_sep
+    lowered = [s.lower() for s in snippets]
+    corpus = sep.join(lowered)
 
-def predict_detailed(code: str) -> dict:
+    # Offset of each snippet inside the joined corpus.
+    starts = []
+    offset = 0
+    for s in lowered:
+        starts.append(offset)
+        offset += len(s) + len(sep)
+
+    labels = ["secure"] * len(snippets)
+    pos = 0
+    while True:
+        match = tables.combined.search(corpus, pos)
+        if match is None:
+            break
+
+        idx = bisect_right(starts, match.start()) - 1
+        end = starts[idx] + len(lowered[idx])
+        # A match running past the separator straddles two snippets; decide
+        # that snippet on its own instead.
+        if match.end() <= end or tables.combined.search(lowered[idx]):
+            labels[idx] = "insecure"
+
+        # The snippet is decided either way; resume at the next one.
+        pos = end + len(sep)
+
+    return labels
+
+
+def predict_detailed(code: str | bytes) -> dict:
     """
     Classify a snippet and return which rules triggered.
 
     Args:
-        code: Java source code string.
+        code: Java source code, as a string or as raw bytes.
 
     Returns:
         dict with 'label' and 'triggered_rules' keys.
     """
-    triggered = []
-    for rule_name, pattern in _RULES:
-        if pattern.search(code):
-            triggered.append(rule_name)
+    tables = _tables_for(code)
+    lowered = code.lower()
+    triggered = (
+        _triggered_rules(lowered, tables) if _has_anchor(lowered, tables) else []
+    )
 
     return {
         "label": "insecure" if triggered else "secure",
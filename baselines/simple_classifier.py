@@ -8,12 +8,44 @@ Usage:
     clf = SimpleClassifier(max_features=5000)
     clf.train(train_codes, train_labels)
     predictions = clf.predict(test_codes)
+
+Fitted pipelines are cached on disk (see DEFAULT_CACHE_DIR), keyed by a
+fingerprint of the training data and model parameters, so retraining on an
+unchanged dataset just reloads the previous fit.
 """
 
+import hashlib
+import os
+from collections import OrderedDict
+
+import joblib
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
-from typing import List
+from typing import List, Optional
+
+from utils.cache import dump_atomic
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "crypto-misuse")
+
+# Distinct snippets whose predictions are remembered per trained model
+PRED_CACHE_SIZE = 4096
+
+
+def _content_key(code) -> int:
+    """64-bit content hash of a snippet, used as the prediction-cache key."""
+    # surrogatepass keeps str snippets with lone surrogates hashable
+    data = code if isinstance(code, bytes) else code.encode("utf-8", "surrogatepass")
+    if HAS_XXHASH:
+        return xxhash.xxh64(data).intdigest()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
 
 
 class SimpleClassifier:
@@ -25,36 +57,53 @@ class SimpleClassifier:
     'secure' vs 'insecure'.
     """
 
-    def __init__(self, max_features: int = 5000, random_seed: int = 42):
+    def __init__(
+        self,
+        max_features: int = 5000,
+        random_seed: int = 42,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    ):
         """
         Args:
             max_features: Maximum number of TF-IDF features.
             random_seed:  Random seed for reproducibility.
+            cache_dir:    Directory for cached fitted pipelines, or None to
+                          always train from scratch.
         """
         self.max_features = max_features
         self.random_seed = random_seed
+        self.cache_dir = cache_dir
 
         self._pipeline = Pipeline([
             ("tfidf", TfidfVectorizer(
                 max_features=max_features,
                 token_pattern=r"(?u)\b\w[\w.]*\b",  # keep dots for API names
                 ngram_range=(1, 2),
+                decode_error="replace",  # bytes snippets are decoded as UTF-8
                 sublinear_tf=True,
+                dtype=np.float32,
             )),
             ("clf", LogisticRegression(
                 random_state=random_seed,
-                max_iter=1000,
-                solver="lbfgs",
+                max_iter=200,
+                solver="liblinear",  # coordinate descent directly on sparse CSR
+                C=1.0,
             )),
         ])
         self._is_trained = False
+        # Fitted steps, bound after training so predict() skips Pipeline
+        self._tfidf = None
+        self._clf = None
+        # content hash -> predicted label, valid for the current fit only;
+        # least recently used entries are evicted beyond PRED_CACHE_SIZE
+        self._pred_cache = OrderedDict()
 
     def train(self, codes: List[str], labels: List[str]) -> None:
         """
         Train the classifier.
 
         Args:
-            codes:  List of Java source code strings.
+            codes:  List of Java source code strings (or UTF-8 bytes).
             labels: Corresponding list of 'secure' / 'insecure' labels.
         """
         if len(codes) != len(labels):
@@ -62,22 +111,125 @@ class SimpleClassifier:
                 f"codes ({len(codes)}) and labels ({len(labels)}) must have "
                 f"the same length."
             )
+
+        self._pred_cache.clear()
+
+        cache_path = self._cache_path(codes, labels)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                self._pipeline = joblib.load(cache_path)
+            except Exception:
+                # Truncated or corrupt entry (joblib surfaces this as EOFError,
+                # UnpicklingError, ValueError, ...): treat it as a miss.
+                pass
+            else:
+                self._bind_fitted_steps()
+                return
+
         self._pipeline.fit(codes, labels)
+        self._bind_fitted_steps()
+
+        if cache_path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                dump_atomic(self._pipeline, cache_path)
+            except OSError:
+                pass  # caching is best-effort (e.g. read-only or odd HOME)
+
+    @property
+    def pipeline(self) -> Pipeline:
+        """The underlying sklearn Pipeline (fitted once train() has run)."""
+        return self._pipeline
+
+    def use_fitted_pipeline(self, pipeline: Pipeline) -> None:
+        """
+        Adopt an already fitted pipeline instead of training, e.g. one
+        restored from a cache of `pipeline`.
+        """
+        self._pred_cache.clear()
+        self._pipeline = pipeline
+        self._bind_fitted_steps()
+
+    def _bind_fitted_steps(self) -> None:
+        """Keep direct references to the fitted steps for the predict path."""
+        self._tfidf = self._pipeline.named_steps["tfidf"]
+        self._clf = self._pipeline.named_steps["clf"]
         self._is_trained = True
 
+    def params_fingerprint(self) -> str:
+        """
+        Stable description of the model configuration, for cache keys.
+
+        Covers the leaf hyper-parameters of every pipeline step, so a cache
+        keyed on it misses whenever the model definition changes.
+        """
+        params = self._pipeline.get_params(deep=True)
+        leaf_params = repr(sorted(
+            (k, repr(v)) for k, v in params.items() if "__" in k
+        ))
+        return f"{leaf_params}|{self.max_features}|{self.random_seed}"
+
+    def _cache_path(self, codes: List[str], labels: List[str]) -> Optional[str]:
+        """Cache file for this training set and configuration (None if disabled)."""
+        if not self.cache_dir:
+            return None
+
+        # surrogatepass: str snippets may carry lone surrogates (e.g. from
+        # surrogateescape decoding), which plain UTF-8 encoding rejects.
+        h = hashlib.sha1()
+        for code in codes:
+            h.update(
+                code if isinstance(code, bytes)
+                else code.encode("utf-8", "surrogatepass")
+            )
+            h.update(b"\x00")
+        h.update(b"\n---\n")
+        h.update("\n".join(labels).encode("utf-8", "surrogatepass"))
+        h.update(self.params_fingerprint().encode("utf-8"))
+        return os.path.join(self.cache_dir, f"clf-{h.hexdigest()}.joblib")
+
     def predict(self, codes: List[str]) -> List[str]:
         """
         Predict labels for a list of code snippets.
 
         Args:
-            codes: List of Java source code strings.
+            codes: List of Java source code strings (or UTF-8 bytes).
 
         Returns:
             List of predicted labels ('secure' or 'insecure').
+
+        Predictions are cached by snippet content (the PRED_CACHE_SIZE most
+        recently used snippets), so repeated or duplicate snippets are only
+        vectorized once per trained model.
         """
         if not self._is_trained:
             raise RuntimeError("Classifier has not been trained yet. Call train() first.")
-        return self._pipeline.predict(codes).tolist()
+
+        cache = self._pred_cache
+        keys = [_content_key(code) for code in codes]
+        # Labels for this call, kept separately so that evictions below
+        # cannot drop an entry the result still needs.
+        found = {}
+        misses = {}
+        for key, code in zip(keys, codes):
+            if key in found or key in misses:
+                continue
+            label = cache.get(key)
+            if label is None:
+                misses[key] = code
+            else:
+                cache.move_to_end(key)
+                found[key] = label
+
+        if misses:
+            features = self._tfidf.transform(list(misses.values()))
+            preds = self._clf.predict(features).tolist()
+            found.update(zip(misses.keys(), preds))
+            cache.update(zip(misses.keys(), preds))
+            while len(cache) > PRED_CACHE_SIZE:
+                cache.popitem(last=False)
+
+        return [found[key] for key in keys]
 
     def predict_proba(self, codes: List[str]) -> List[dict]:
         """
@@ -88,8 +240,8 @@ class SimpleClassifier:
         """
         if not self._is_trained:
             raise RuntimeError("Classifier has not been trained yet. Call train() first.")
-        probas = self._pipeline.predict_proba(codes)
-        classes = self._pipeline.classes_
+        probas = self._clf.predict_proba(self._tfidf.transform(codes))
+        classes = self._clf.classes_
         return [
             {cls: float(prob) for cls, prob in zip(classes, row)}
             for row in probas
@@ -11,6 +11,9 @@ Returns a list of dicts with the unified format:
 import os
 import re
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from datasets.fileutils import iter_matching_files
 
 logger = logging.getLogger(__name__)
 
@@ -38,39 +41,50 @@ def load_dataset(data_dir: str) -> list:
         logger.warning(f"CryptoAPI-Bench directory not found: {data_dir}")
         return samples
 
-    for root, _dirs, files in os.walk(data_dir):
-        for fname in files:
-            if not fname.endswith(".java"):
-                continue
-
-            fpath = os.path.join(root, fname)
-            label = _infer_label(fname)
-
-            if label is None:
-                logger.debug(f"Skipping (no label inferred): {fname}")
-                continue
-
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="replace") as f:
-                    code = f.read()
-            except OSError as e:
-                logger.warning(f"Could not read {fpath}: {e}")
-                continue
-
-            samples.append({
-                "code_snippet": code,
-                "label": label,
-                "metadata": {
-                    "source": "cryptoapi_bench",
-                    "filename": fname,
-                    "filepath": fpath,
-                },
-            })
+    # Resolve paths and labels first, then read the files concurrently —
+    # file reads release the GIL, so a thread pool overlaps the I/O.
+    fpaths = []
+    labels = []
+    for fpath in iter_matching_files(data_dir, lambda n: n.endswith(".java")):
+        fname = os.path.basename(fpath)
+        label = _infer_label(fname)
+
+        if label is None:
+            logger.debug(f"Skipping (no label inferred): {fname}")
+            continue
+
+        fpaths.append(fpath)
+        labels.append(label)
+
+    with ThreadPoolExecutor() as pool:
+        samples = [
+            s for s in pool.map(_load_sample, fpaths, labels) if s is not None
+        ]
 
     logger.info(f"CryptoAPI-Bench: loaded {len(samples)} samples from {data_dir}")
     return samples
 
 
+def _load_sample(fpath: str, label: str) -> dict | None:
+    """Read one Java file into a sample dict; None if it cannot be read."""
+    try:
+        with open(fpath, "r", encoding="utf-8", errors="replace") as f:
+            code = f.read()
+    except OSError as e:
+        logger.warning(f"Could not read {fpath}: {e}")
+        return None
+
+    return {
+        "code_snippet": code,
+        "label": label,
+        "metadata": {
+            "source": "cryptoapi_bench",
+            "filename": os.path.basename(fpath),
+            "filepath": fpath,
+        },
+    }
+
+
 def _infer_label(filename: str) -> str | None:
     """
     Infer a secure/insecure label from the Java filename.
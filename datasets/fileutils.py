@@ -0,0 +1,35 @@
+"""
+fileutils.py — Filesystem helpers shared by the dataset loaders.
+"""
+
+import os
+import logging
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+def iter_matching_files(root: str, predicate: Callable[[str], bool]) -> Iterator[str]:
+    """
+    Yield the paths of all files under root whose name satisfies predicate.
+
+    Walks the tree with os.scandir directly: directory entries carry their
+    type, so no per-file stat() is needed, and a single pass replaces
+    recursive globbing.  Symlinked directories are not followed, hidden
+    directories (e.g. .git) are skipped as `**` globbing does, and
+    unreadable directories are skipped.
+
+    Args:
+        root:      Directory to walk.
+        predicate: Called with each file name (not the full path).
+    """
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        yield from iter_matching_files(entry.path, predicate)
+                elif predicate(entry.name):
+                    yield entry.path
+    except OSError as e:
+        logger.debug(f"Skipping unreadable directory {root}: {e}")
@@ -13,10 +13,12 @@ used; otherwise, the loader falls back to filename heuristics.
 """
 
 import csv
-import glob
 import os
 import re
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from datasets.fileutils import iter_matching_files
 
 logger = logging.getLogger(__name__)
 
@@ -50,19 +52,15 @@ def load_dataset(data_dir: str, crypto_only: bool = True) -> list:
     # Try to load the expected-results CSV
     labels_map, cwe_map = _load_expected_results(data_dir)
 
-    # Locate Java test-case files
-    src_patterns = [
-        os.path.join(data_dir, "src", "main", "java", "**", "BenchmarkTest*.java"),
-        os.path.join(data_dir, "**", "BenchmarkTest*.java"),
-    ]
-
-    java_files = []
-    for pattern in src_patterns:
-        java_files.extend(glob.glob(pattern, recursive=True))
-
-    # De-duplicate (in case both patterns match the same file)
-    java_files = list(set(java_files))
+    # Locate Java test-case files in a single walk of the clone
+    java_files = list(iter_matching_files(
+        data_dir,
+        lambda n: n.startswith("BenchmarkTest") and n.endswith(".java"),
+    ))
 
+    # Resolve labels first, then read the files concurrently — file reads
+    # release the GIL, so a thread pool overlaps the I/O.
+    selected = []
     for fpath in java_files:
         fname = os.path.basename(fpath)
         test_num = _extract_test_number(fname)
@@ -85,24 +83,13 @@ def load_dataset(data_dir: str, crypto_only: bool = True) -> list:
             if label is None:
                 continue
 
-        try:
-            with open(fpath, "r", encoding="utf-8", errors="replace") as f:
-                code = f.read()
-        except OSError as e:
-            logger.warning(f"Could not read {fpath}: {e}")
-            continue
+        selected.append((fpath, label, test_num, cwe_map.get(test_num, "unknown")))
 
-        samples.append({
-            "code_snippet": code,
-            "label": label,
-            "metadata": {
-                "source": "owasp_benchmark",
-                "filename": fname,
-                "filepath": fpath,
-                "test_number": test_num,
-                "cwe": cwe_map.get(test_num, "unknown"),
-            },
-        })
+    with ThreadPoolExecutor() as pool:
+        samples = [
+            s for s in pool.map(lambda args: _load_sample(*args), selected)
+            if s is not None
+        ]
 
     logger.info(f"OWASP Benchmark: loaded {len(samples)} samples from {data_dir}")
     return samples
@@ -111,6 +98,28 @@ def load_dataset(data_dir: str, crypto_only: bool = True) -> list:
 # ── Internal helpers ────────────────────────────────────────────────
 
 
+def _load_sample(fpath: str, label: str, test_num: str, cwe: str) -> dict | None:
+    """Read one BenchmarkTest file into a sample dict; None if unreadable."""
+    try:
+        with open(fpath, "r", encoding="utf-8", errors="replace") as f:
+            code = f.read()
+    except OSError as e:
+        logger.warning(f"Could not read {fpath}: {e}")
+        return None
+
+    return {
+        "code_snippet": code,
+        "label": label,
+        "metadata": {
+            "source": "owasp_benchmark",
+            "filename": os.path.basename(fpath),
+            "filepath": fpath,
+            "test_number": test_num,
+            "cwe": cwe,
+        },
+    }
+
+
 def _load_expected_results(data_dir: str) -> tuple:
     """
     Parse the expected-results CSV that ships with OWASP Benchmark.
@@ -122,15 +131,15 @@ def _load_expected_results(data_dir: str) -> tuple:
     labels_map = {}
     cwe_map = {}
 
-    csv_candidates = glob.glob(
-        os.path.join(data_dir, "**/expectedresults*.csv"), recursive=True
-    )
+    csv_path = next(iter_matching_files(
+        data_dir,
+        lambda n: n.startswith("expectedresults") and n.endswith(".csv"),
+    ), None)
 
-    if not csv_candidates:
+    if csv_path is None:
         logger.info("No expected-results CSV found; falling back to filename heuristics.")
         return labels_map, cwe_map
 
-    csv_path = csv_candidates[0]
     logger.info(f"Loading OWASP labels from: {csv_path}")
 
     try:
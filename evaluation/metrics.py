@@ -8,13 +8,8 @@ Usage:
     # {'accuracy': 0.85, 'precision': 0.80, 'recall': 0.90, 'f1': 0.85}
 """
 
-from sklearn.metrics import (
-    accuracy_score,
-    f1_score,
-    precision_score,
-    recall_score,
-    confusion_matrix
-)
+import numpy as np
+from sklearn.metrics import accuracy_score, confusion_matrix
 from typing import List
 
 
@@ -35,17 +30,32 @@ def compute_metrics(
     Returns:
         Dict with keys: accuracy, precision, recall, f1.
     """
+    yt = np.asarray(y_true)
+    yp = np.asarray(y_pred)
+    if yt.shape != yp.shape:
+        raise ValueError(
+            f"y_true ({len(yt)}) and y_pred ({len(yp)}) must have the same length."
+        )
+
+    # One vectorised pass for the confusion counts of the positive class,
+    # instead of four sklearn metric calls that each re-validate the input.
+    true_pos = yt == pos_label
+    pred_pos = yp == pos_label
+    tp = int(np.count_nonzero(true_pos & pred_pos))
+    fp = int(np.count_nonzero(~true_pos & pred_pos))
+    fn = int(np.count_nonzero(true_pos & ~pred_pos))
+
+    n = len(yt)
+    accuracy = np.count_nonzero(yt == yp) / n if n else 0.0
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * tp / (2 * tp + fp + fn) if tp + fp + fn else 0.0
+
     return {
-        "accuracy": round(accuracy_score(y_true, y_pred), 4),
-        "precision": round(
-            precision_score(y_true, y_pred, pos_label=pos_label, zero_division=0), 4
-        ),
-        "recall": round(
-            recall_score(y_true, y_pred, pos_label=pos_label, zero_division=0), 4
-        ),
-        "f1": round(
-            f1_score(y_true, y_pred, pos_label=pos_label, zero_division=0), 4
-        ),
+        "accuracy": round(float(accuracy), 4),
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
     }
 
 def compute_confusion_matrix(y_true: List[str], y_pred: List[str], labels=["secure", "insecure"]) -> dict:
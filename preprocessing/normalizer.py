@@ -11,6 +11,18 @@ Usage:
 import re
 
 
+# Comments and string/char literals in one left-to-right scan.  Literals are
+# matched (and kept) so comment markers inside them are not stripped.
+_COMMENT_RE = re.compile(
+    r"(\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*')"
+    r"|/\*.*?\*/"
+    r"|//[^\n]*",
+    re.DOTALL,
+)
+
+_MULTI_SPACE_RE = re.compile(r" {2,}")
+
+
 def normalize(
     code: str,
     remove_comments: bool = True,
@@ -48,11 +60,7 @@ def normalize(
 
 def _remove_comments(code: str) -> str:
     """Remove Java single-line and multi-line comments."""
-    # Multi-line comments (non-greedy)
-    code = re.sub(r"/\*.*?\*/", "", code, flags=re.DOTALL)
-    # Single-line comments
-    code = re.sub(r"//[^\n]*", "", code)
-    return code
+    return _COMMENT_RE.sub(lambda m: m.group(1) or "", code)
 
 
 def _normalize_whitespace(code: str) -> str:
@@ -60,7 +68,7 @@ def _normalize_whitespace(code: str) -> str:
     # Replace tabs with spaces
     code = code.replace("\t", " ")
     # Collapse multiple spaces into one
-    code = re.sub(r" {2,}", " ", code)
+    code = _MULTI_SPACE_RE.sub(" ", code)
     # Remove blank lines
     lines = [line.strip() for line in code.splitlines() if line.strip()]
     return "\n".join(lines)
@@ -91,14 +99,17 @@ def _normalize_variables(code: str) -> str:
         "System", "out", "println", "String", "Integer", "key",
     }
 
-    var_names = []
-    for match in var_pattern.finditer(code):
-        name = match.group(1)
-        if name not in _protected and name not in var_names:
-            var_names.append(name)
-
-    for idx, name in enumerate(var_names):
-        # Use word-boundary replacement to avoid partial matches
-        code = re.sub(rf"\b{re.escape(name)}\b", f"VAR{idx}", code)
-
-    return code
+    # Distinct names in order of first declaration
+    var_names = list(dict.fromkeys(
+        m.group(1) for m in var_pattern.finditer(code)
+        if m.group(1) not in _protected
+    ))
+    if not var_names:
+        return code
+
+    rename = {name: f"VAR{idx}" for idx, name in enumerate(var_names)}
+    # One word-bounded alternation renames every variable in a single pass
+    names_re = re.compile(
+        r"\b(" + "|".join(re.escape(name) for name in var_names) + r")\b"
+    )
+    return names_re.sub(lambda m: rename[m.group(1)], code)
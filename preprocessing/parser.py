@@ -1,7 +1,11 @@
 """
 parser.py — Extract cryptographic-API features from Java source code.
 
-All extraction is regex-based and deterministic (no LLMs).
+All extraction is regex-based and deterministic (no LLMs).  When the
+optional `hyperscan` package is installed, API calls and crypto keywords
+are found in one multi-pattern scan instead of one search per pattern.
+Otherwise, if `pyahocorasick` is installed, the keyword lookup runs as a
+single Aho-Corasick pass.
 
 Usage:
     from preprocessing.parser import extract_features
@@ -11,26 +15,43 @@ Usage:
 import re
 from typing import List
 
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 
 # ── Patterns ────────────────────────────────────────────────────────
 
+# ASCII whitespace.  \s would also match Unicode spaces (and \x1c-\x1f) in
+# re's str patterns but not under Hyperscan, making the extracted API calls
+# depend on which backend is installed.
+_WS = r"[ \t\n\r\f\v]"
+
 # Common Java crypto API calls
 _API_CALL_PATTERNS = [
-    r"Cipher\.getInstance\s*\(",
-    r"MessageDigest\.getInstance\s*\(",
-    r"SecretKeySpec\s*\(",
-    r"KeyGenerator\.getInstance\s*\(",
-    r"SecureRandom\s*\(",
-    r"KeyPairGenerator\.getInstance\s*\(",
-    r"Mac\.getInstance\s*\(",
-    r"Signature\.getInstance\s*\(",
-    r"KeyStore\.getInstance\s*\(",
-    r"PBEKeySpec\s*\(",
-    r"PBEParameterSpec\s*\(",
-    r"IvParameterSpec\s*\(",
-    r"GCMParameterSpec\s*\(",
-    r"TrustManagerFactory\.getInstance\s*\(",
-    r"SSLContext\.getInstance\s*\(",
+    rf"Cipher\.getInstance{_WS}*\(",
+    rf"MessageDigest\.getInstance{_WS}*\(",
+    rf"SecretKeySpec{_WS}*\(",
+    rf"KeyGenerator\.getInstance{_WS}*\(",
+    rf"SecureRandom{_WS}*\(",
+    rf"KeyPairGenerator\.getInstance{_WS}*\(",
+    rf"Mac\.getInstance{_WS}*\(",
+    rf"Signature\.getInstance{_WS}*\(",
+    rf"KeyStore\.getInstance{_WS}*\(",
+    rf"PBEKeySpec{_WS}*\(",
+    rf"PBEParameterSpec{_WS}*\(",
+    rf"IvParameterSpec{_WS}*\(",
+    rf"GCMParameterSpec{_WS}*\(",
+    rf"TrustManagerFactory\.getInstance{_WS}*\(",
+    rf"SSLContext\.getInstance{_WS}*\(",
 ]
 
 # Crypto-related keywords (case-insensitive search)
@@ -55,6 +76,85 @@ _HARDCODED_PATTERNS = [
     r'\"[0-9a-fA-F]{16,}\"',
 ]
 
+_API_CALL_RES = [re.compile(p) for p in _API_CALL_PATTERNS]
+_HARDCODED_RES = [re.compile(p) for p in _HARDCODED_PATTERNS]
+
+# Structural elements counted by _extract_structural_tokens
+_IMPORT_RE = re.compile(r"^\s*import\s+", re.MULTILINE)
+_CLASS_RE = re.compile(r"\b(?:class|interface|enum)\s+\w+")
+_METHOD_RE = re.compile(
+    r"(?:public|private|protected|static|\s)+[\w<>\[\]]+\s+\w+\s*\("
+)
+
+
+def _build_keyword_automaton():
+    """Aho-Corasick automaton over the upper-cased keywords (value = index)."""
+    automaton = ahocorasick.Automaton()
+    for idx, kw in enumerate(_CRYPTO_KEYWORDS):
+        automaton.add_word(kw.upper(), idx)
+    automaton.make_automaton()
+    return automaton
+
+
+_KW_AC = _build_keyword_automaton() if HAS_AHOCORASICK else None
+
+
+# ── Hyperscan backend ───────────────────────────────────────────────
+# A single database holds the API-call patterns (IDs 0..len-1, with
+# start-of-match tracking so the matched text can be sliced back out)
+# followed by the crypto keywords (case-insensitive, reported once each).
+
+
+def _compile_hyperscan_db():
+    """Compile API-call patterns and crypto keywords into one database."""
+    expressions = [p.encode("ascii") for p in _API_CALL_PATTERNS]
+    flags = [hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_API_CALL_PATTERNS)
+
+    expressions += [re.escape(kw).encode("ascii") for kw in _CRYPTO_KEYWORDS]
+    flags += [
+        hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+    ] * len(_CRYPTO_KEYWORDS)
+
+    db = hyperscan.Database()
+    db.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=flags,
+    )
+    return db
+
+
+_HS_DB = _compile_hyperscan_db() if HAS_HYPERSCAN else None
+
+
+def _hyperscan_scan(code: str) -> tuple:
+    """
+    Scan the code once for both API calls and crypto keywords.
+
+    Returns:
+        (api_calls, crypto_keywords) in the same order the per-pattern
+        regex helpers produce them.
+    """
+    data = code.encode("utf-8", errors="replace")
+    n_api = len(_API_CALL_PATTERNS)
+    api_hits = []
+    kw_ids = set()
+
+    def on_match(pattern_id, start, end, _flags, _context):
+        if pattern_id < n_api:
+            api_hits.append((pattern_id, start, end))
+        else:
+            kw_ids.add(pattern_id - n_api)
+
+    _HS_DB.scan(data, match_event_handler=on_match)
+
+    api_calls = [
+        data[start:end].decode("utf-8") for _, start, end in sorted(api_hits)
+    ]
+    crypto_kw = [_CRYPTO_KEYWORDS[i] for i in sorted(kw_ids)]
+    return api_calls, crypto_kw
+
 
 def extract_features(code: str) -> dict:
     """
@@ -68,8 +168,11 @@ def extract_features(code: str) -> dict:
                                 method_count
             hardcoded_secrets — list of potential hardcoded key/IV matches
     """
-    api_calls = _extract_api_calls(code)
-    crypto_kw = _extract_crypto_keywords(code)
+    if _HS_DB is not None:
+        api_calls, crypto_kw = _hyperscan_scan(code)
+    else:
+        api_calls = _extract_api_calls(code)
+        crypto_kw = _extract_crypto_keywords(code)
     structural = _extract_structural_tokens(code)
     hardcoded = _extract_hardcoded_secrets(code)
 
@@ -87,16 +190,38 @@ def extract_features(code: str) -> dict:
 def _extract_api_calls(code: str) -> List[str]:
     """Find all matching crypto API call patterns."""
     matches = []
-    for pattern in _API_CALL_PATTERNS:
-        found = re.findall(pattern, code)
-        matches.extend(found)
+    for pattern in _API_CALL_RES:
+        matches.extend(pattern.findall(code))
     return matches
 
 
+def _ascii_upper(code: str) -> str:
+    """
+    Upper-case ASCII letters only, matching Hyperscan's caseless mode.
+
+    str.upper() also folds non-ASCII letters onto ASCII ones (e.g. 'ı' -> 'I',
+    'ſ' -> 'S', 'ß' -> 'SS'), which would let keywords match text that the
+    Hyperscan backend does not.  bytes.upper() touches ASCII letters only.
+    """
+    return code.encode("utf-8", "surrogatepass").upper().decode(
+        "utf-8", "surrogatepass"
+    )
+
+
 def _extract_crypto_keywords(code: str) -> List[str]:
     """Find all crypto keywords present in the code (case-insensitive)."""
+    code_upper = _ascii_upper(code)
+    if _KW_AC is not None:
+        # One linear scan finds every keyword occurrence at once
+        hit_ids = {idx for _end, idx in _KW_AC.iter(code_upper)}
+        return [_CRYPTO_KEYWORDS[idx] for idx in sorted(hit_ids)]
+
+    # Fallback: upper-case once, then plain substring tests.  str.__contains__
+    # runs a C fast-search, so this beats a single case-insensitive keyword
+    # alternation by more than an order of magnitude — the regex engine has to
+    # try the alternation at every offset, which costs far more than the
+    # temporary upper-cased copy.
     found = []
-    code_upper = code.upper()
     for kw in _CRYPTO_KEYWORDS:
         if kw.upper() in code_upper:
             found.append(kw)
@@ -105,16 +230,9 @@ def _extract_crypto_keywords(code: str) -> List[str]:
 
 def _extract_structural_tokens(code: str) -> dict:
     """Count basic structural elements: imports, classes, methods."""
-    import_count = len(re.findall(r"^\s*import\s+", code, re.MULTILINE))
-    class_count = len(
-        re.findall(r"\b(?:class|interface|enum)\s+\w+", code)
-    )
-    method_count = len(
-        re.findall(
-            r"(?:public|private|protected|static|\s)+[\w<>\[\]]+\s+\w+\s*\(",
-            code,
-        )
-    )
+    import_count = sum(1 for _ in _IMPORT_RE.finditer(code))
+    class_count = sum(1 for _ in _CLASS_RE.finditer(code))
+    method_count = sum(1 for _ in _METHOD_RE.finditer(code))
     return {
         "import_count": import_count,
         "class_count": class_count,
@@ -125,7 +243,6 @@ def _extract_structural_tokens(code: str) -> dict:
 def _extract_hardcoded_secrets(code: str) -> List[str]:
     """Detect potential hardcoded keys, IVs, or secrets."""
     matches = []
-    for pattern in _HARDCODED_PATTERNS:
-        found = re.findall(pattern, code)
-        matches.extend(found)
+    for pattern in _HARDCODED_RES:
+        matches.extend(pattern.findall(code))
     return matches
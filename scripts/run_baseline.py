@@ -6,23 +6,38 @@ Usage:
 
 Reads config from configs/default.yaml, loads the processed dataset,
 runs both baselines, and prints a comparison table.
+
+The trained classifier and its test split are cached under cache/, keyed by
+the dataset's mtime, the split settings and the classifier's hyper-parameters,
+so an unchanged rerun skips training.
 """
 
-import json
+import hashlib
+import mmap
 import os
+import pickle
 import sys
 import logging
 
+try:
+    import orjson as _json  # C JSON parser, same loads() semantics
+except ImportError:
+    import json as _json
+
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
+CONFIG_PATH = os.path.join(PROJECT_ROOT, "configs", "default.yaml")
 
-import yaml
+import joblib
+import numpy as np
 from sklearn.model_selection import train_test_split
 
 from baselines.rule_based import predict_batch as rule_predict_batch
 from baselines.simple_classifier import SimpleClassifier
 from evaluation.metrics import compute_metrics
 from evaluation.evaluate import print_results_table
+from utils.cache import dump_atomic
+from utils.config import load_yaml_cached
 
 logging.basicConfig(
     level=logging.ERROR,
@@ -30,61 +45,192 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Class codes used for the stratified split.  Ordered like the sorted label
+# strings, so splits match those stratified on the strings themselves.
+LABELS = ("insecure", "secure")
+LABEL_IDS = {label: i for i, label in enumerate(LABELS)}
+
+# Trained classifiers and their test splits, reused across runs
+CACHE_DIR = os.path.join(PROJECT_ROOT, "cache")
+# Part of the cache key; bump whenever the layout of a cache entry changes
+BASELINE_CACHE_FORMAT = 2
+
 
 def load_config() -> dict:
     """Load default YAML configuration."""
-    config_path = os.path.join(PROJECT_ROOT, "configs", "default.yaml")
-    with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+    return load_yaml_cached(CONFIG_PATH)
 
 
 def load_dataset(path: str) -> list:
-    """Load a JSONL dataset file."""
-    samples = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                samples.append(json.loads(line))
-    return samples
+    """
+    Load a JSONL dataset file.
+
+    The file is memory-mapped and parsed straight from the page cache,
+    so its contents are never copied into an intermediate read buffer.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return [
+                _json.loads(line) for line in iter(mm.readline, b"")
+                if not line.isspace()
+            ]
+
+
+def load_columns(path: str) -> tuple:
+    """
+    Load the code and label columns of the processed dataset.
+
+    prepare_data.py also writes the two columns to a pickle next to the
+    JSONL (dataset.pkl).  That pickle is used whenever it is at least as new
+    as the JSONL, which skips JSON parsing entirely; otherwise the JSONL is
+    parsed.
+
+    Returns:
+        (codes, labels) — parallel lists of snippet and label strings.
+    """
+    jsonl_mtime = os.stat(path).st_mtime_ns  # FileNotFoundError if missing
+    pickle_path = os.path.splitext(path)[0] + ".pkl"
+    try:
+        if os.stat(pickle_path).st_mtime_ns >= jsonl_mtime:
+            with open(pickle_path, "rb") as f:
+                columns = pickle.load(f)
+            return columns["codes"], columns["labels"]
+    except (OSError, EOFError, ValueError, KeyError, TypeError, pickle.PickleError):
+        pass  # missing, stale or unreadable pickle — parse the JSONL
+
+    # Extract both columns in one pass over the samples; the sample dicts
+    # (and their metadata) are released on return, before the TF-IDF
+    # matrices are built.
+    codes = []
+    labels = []
+    add_code = codes.append
+    add_label = labels.append
+    for s in load_dataset(path):
+        add_code(s["code_snippet"])
+        add_label(s["label"])
+    return codes, labels
+
+
+def baseline_cache_path(
+    dataset_path: str, seed: int, test_split: float, clf: SimpleClassifier
+) -> str:
+    """
+    Cache file for the trained classifier and test split of one run setup.
+
+    Keyed by the dataset's mtime, the split settings and the classifier's
+    full hyper-parameter fingerprint, so rerunning with an unchanged dataset
+    and configuration skips loading, splitting and training altogether.
+    """
+    mtime = os.stat(dataset_path).st_mtime_ns  # FileNotFoundError if missing
+    key = hashlib.blake2b(
+        f"{BASELINE_CACHE_FORMAT}|{mtime}|{seed}|{test_split}|"
+        f"{clf.params_fingerprint()}".encode("utf-8")
+    ).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"baseline_{key}.joblib")
+
+
+def load_cached_baseline(cache_path: str) -> tuple | None:
+    """
+    Load (pipeline, test_codes, test_labels) from cache_path.
+
+    Entries hold the fitted sklearn Pipeline rather than the SimpleClassifier
+    instance, so changes to the wrapper class never meet a stale pickle.
+    Returns None on a miss, including a truncated or corrupt cache file,
+    so the caller falls back to splitting and training.
+    """
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        pipeline, test_codes, test_labels = joblib.load(cache_path)
+    except Exception:
+        # joblib surfaces a damaged file as EOFError, UnpicklingError,
+        # ValueError, ... depending on where it was cut off.
+        logger.warning("Ignoring unreadable baseline cache %s", cache_path)
+        return None
+    return pipeline, test_codes, test_labels
+
+
+def split_dataset(dataset_path: str, seed: int, test_split: float) -> tuple:
+    """
+    Load the dataset and make the stratified train/test split.
+
+    Returns:
+        (train_codes, test_codes, train_labels, test_labels)
+    """
+    codes, labels = load_columns(dataset_path)
+    logger.info("Loaded %d samples from %s", len(codes), dataset_path)
+
+    # Stratify on int8 class codes rather than label strings, and split row
+    # indices so the snippets themselves are only referenced, never copied.
+    label_ids = np.fromiter(
+        (LABEL_IDS[label] for label in labels), dtype=np.int8, count=len(labels)
+    )
+    train_idx, test_idx = train_test_split(
+        np.arange(len(codes)), test_size=test_split, random_state=seed,
+        stratify=label_ids,
+    )
+    train_codes = [codes[i] for i in train_idx]
+    test_codes = [codes[i] for i in test_idx]
+    train_labels = [LABELS[i] for i in label_ids[train_idx]]
+    test_labels = [LABELS[i] for i in label_ids[test_idx]]
+
+    logger.info(
+        "Split: %d train / %d test (seed=%s, split=%s)",
+        len(train_codes), len(test_codes), seed, test_split,
+    )
+    return train_codes, test_codes, train_labels, test_labels
 
 
 def main():
     config = load_config()
     training_cfg = config.get("training", {})
     baselines_cfg = config.get("baselines", {})
+    clf_cfg = baselines_cfg.get("simple_classifier", {})
+
+    seed = training_cfg.get("random_seed", 42)
+    test_split = training_cfg.get("test_split", 0.2)
+    max_features = clf_cfg.get("max_features", 5000)
+    clf_enabled = clf_cfg.get("enabled", True)
 
-    # ── Load dataset ─────────────────────────────────────────────
+    # ── Load dataset / train-test split ──────────────────────────
     dataset_path = os.path.join(
         PROJECT_ROOT, config["dataset"]["processed_file"]
     )
 
-    if not os.path.exists(dataset_path):
+    clf = None
+    cached = None
+    if clf_enabled:
+        # The fitted pipeline is cached per run below, together with its
+        # test split, so the classifier's own disk cache would only store
+        # a second copy of it.
+        clf = SimpleClassifier(
+            max_features=max_features, random_seed=seed, cache_dir=None
+        )
+    try:
+        if clf is not None:
+            cache_path = baseline_cache_path(dataset_path, seed, test_split, clf)
+            cached = load_cached_baseline(cache_path)
+        if cached is not None:
+            # Fitted pipeline plus the test split it was evaluated on
+            pipeline, test_codes, test_labels = cached
+            clf.use_fitted_pipeline(pipeline)
+            logger.info("Loaded cached classifier and split from %s", cache_path)
+        else:
+            train_codes, test_codes, train_labels, test_labels = split_dataset(
+                dataset_path, seed, test_split
+            )
+    except FileNotFoundError:
         logger.error(
-            f"Dataset not found: {dataset_path}\n"
-            f"Run 'python scripts/prepare_data.py' first."
+            "Dataset not found: %s\n"
+            "Run 'python scripts/prepare_data.py' first.",
+            dataset_path,
         )
         sys.exit(1)
 
-    samples = load_dataset(dataset_path)
-    logger.info(f"Loaded {len(samples)} samples from {dataset_path}")
-
-    codes = [s["code_snippet"] for s in samples]
-    labels = [s["label"] for s in samples]
-
-    # ── Train / test split ───────────────────────────────────────
-    seed = training_cfg.get("random_seed", 42)
-    test_split = training_cfg.get("test_split", 0.2)
-
-    train_codes, test_codes, train_labels, test_labels = train_test_split(
-        codes, labels, test_size=test_split, random_state=seed, stratify=labels,
-    )
-
-    logger.info(
-        f"Split: {len(train_codes)} train / {len(test_codes)} test "
-        f"(seed={seed}, split={test_split})"
-    )
-
     results = {}
 
     # ── Rule-based baseline ──────────────────────────────────────
@@ -94,15 +240,21 @@ def main():
         results["Rule-Based"] = compute_metrics(test_labels, rule_preds)
 
     # ── TF-IDF + Logistic Regression ─────────────────────────────
-    if baselines_cfg.get("simple_classifier", {}).get("enabled", True):
-        max_features = baselines_cfg.get("simple_classifier", {}).get(
-            "max_features", 5000
-        )
-        logger.info("Training TF-IDF + Logistic Regression ...")
-        clf = SimpleClassifier(
-            max_features=max_features, random_seed=seed
-        )
-        clf.train(train_codes, train_labels)
+    if clf_enabled:
+        if cached is None:
+            # The vectorizer is fitted on the training split only and the test
+            # split is transformed separately, so every snippet is tokenized
+            # exactly once.  Vectorizing the whole corpus up front would save
+            # no pass, and it would leak test-set vocabulary and document
+            # frequencies into the IDF weights.
+            logger.info("Training TF-IDF + Logistic Regression ...")
+            clf.train(train_codes, train_labels)
+
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                dump_atomic((clf.pipeline, test_codes, test_labels), cache_path)
+            except OSError:
+                pass  # caching is best-effort (e.g. read-only checkout)
 
         clf_preds = clf.predict(test_codes)
         results["TF-IDF + LogReg"] = compute_metrics(test_labels, clf_preds)
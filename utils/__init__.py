@@ -0,0 +1,3 @@
+"""
+utils package — Small helpers shared by the scripts and the baselines.
+"""
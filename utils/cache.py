@@ -0,0 +1,29 @@
+"""
+cache.py — Crash-safe writes for on-disk joblib caches.
+
+Usage:
+    from utils.cache import dump_atomic
+
+    dump_atomic(model, "cache/model.joblib")
+"""
+
+import os
+import tempfile
+
+import joblib
+
+
+def dump_atomic(obj, path: str, compress: int = 3) -> None:
+    """
+    joblib.dump() to a temp file beside `path`, then rename it into place.
+
+    An interrupted dump therefore never leaves a truncated cache entry.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            joblib.dump(obj, f, compress=compress)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
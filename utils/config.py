@@ -0,0 +1,49 @@
+"""
+config.py — Cached YAML configuration loading for the scripts.
+
+Usage:
+    from utils.config import load_yaml_cached
+
+    config = load_yaml_cached("configs/default.yaml")
+"""
+
+import os
+import pickle
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml C parser
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+def load_yaml_cached(config_path: str) -> dict:
+    """
+    Parse a YAML file, reusing a pickled copy while the file is unchanged.
+
+    The parsed dict is stored next to the YAML as .<name>.pickle together
+    with the YAML's mtime; any change to the file invalidates the cache.
+    """
+    cache_path = os.path.join(
+        os.path.dirname(config_path), f".{os.path.basename(config_path)}.pickle"
+    )
+    mtime = os.stat(config_path).st_mtime_ns
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_mtime, config = pickle.load(f)
+        if cached_mtime == mtime:
+            return config
+    except (OSError, EOFError, ValueError, TypeError, pickle.PickleError):
+        pass  # missing or unreadable cache — fall back to parsing
+
+    with open(config_path, "r") as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump((mtime, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # caching is best-effort (e.g. read-only checkout)
+    return config